@@ -9,11 +9,17 @@ import streamlit as st
 import json
 import re
 import requests
-from PIL import Image, ImageDraw, ImageFont
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import io
 import zipfile
+import functools
+import hashlib
 from urllib.parse import urlparse
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import List, Dict, Set, Optional, Tuple
 
 # Try to import cairosvg with fallback
@@ -23,6 +29,85 @@ try:
 except ImportError:
     CAIROSVG_AVAILABLE = False
 
+# Try to import re2 (optional linear-time regex engine)
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Try to import orjson (optional, faster JSON pretty-printing)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Precompiled URL-extraction pattern (compiled once at import, reused per file).
+# Escaped (\/) and direct URLs are matched in a single pass; every match ends on
+# the image extension, so no trailing-character cleanup or revalidation is needed.
+# The URL body is capped so a long run of "http://" with no image extension costs
+# linear time without RE2 too. RE2 rejects repeat counts above 1000, and at 1000
+# its DFA outgrows the default memory budget and falls back to a slower engine.
+_MAX_URL_LENGTH = 500
+
+def _either_case(word: str) -> str:
+    """Spell out both ASCII cases of each letter, e.g. "gif" -> "[gG][iI][fF]"."""
+    return ''.join(f'[{c.lower()}{c.upper()}]' if c.isalpha() else c for c in word)
+
+# Case and whitespace are spelled out in ASCII instead of using IGNORECASE and \s,
+# because re and RE2 disagree on both: re folds "ı" into "i" and treats NBSP and
+# U+2028 as whitespace, while RE2 folds "ſ" into "s" even where re.ASCII would not
+# and leaves \v out of \s. Spelled out, the two engines return the same matches.
+_SCHEME = _either_case('http') + '[sS]?'
+_IMG_EXT = '(?:' + '|'.join(_either_case(ext) for ext in (
+    'jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'svg', 'tiff', 'tif', 'ico', 'avif', 'heic', 'heif'
+)) + ')'
+_URL_RE = re.compile(
+    rf'{_SCHEME}:\\/\\/[^"\'<>]{{1,{_MAX_URL_LENGTH}}}\.{_IMG_EXT}'
+    rf'|{_SCHEME}://[^"\'<>\t\n\x0b\f\r ]{{1,{_MAX_URL_LENGTH}}}\.{_IMG_EXT}'
+)
+
+# Matcher used for scanning and rewriting: RE2 when google-re2 is installed and
+# compiles the pattern, otherwise _URL_RE itself. RE2 runs the same pattern with
+# the same leftmost-first semantics on an automaton that never backtracks.
+_URL_MATCHER = _URL_RE
+if RE2_AVAILABLE:
+    try:
+        _URL_MATCHER = re2.compile(_URL_RE.pattern)
+    except Exception:
+        _URL_MATCHER = _URL_RE
+
+# Parallel download settings
+MAX_DOWNLOAD_WORKERS = 24
+HTTP_POOL_SIZE = 32
+
+# Placeholder rendering is CPU-bound (Pillow drops the GIL while encoding), so one thread per core
+MAX_RENDER_WORKERS = os.cpu_count() or 1
+
+# Download size limits (bodies larger than this are rejected, not buffered)
+MAX_IMAGE_BYTES = 25 * 1024 * 1024
+MAX_SVG_BYTES = 5 * 1024 * 1024
+
+# Download tab tiles per page; only the current page is rendered on a rerun
+GALLERY_PAGE_SIZE = 16
+
+# Grid previews are downscaled to fit this box once at load time
+PREVIEW_MAX_SIZE = 480
+
+# Gallery widgets (page, comparison toggle, downloads) rerun only the gallery
+# where fragments exist (Streamlit 1.33+); older releases run it as a plain function
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# SVGs are rasterized at no more than this many pixels (aspect ratio kept);
+# filter-heavy SVGs get slow and memory-hungry at full size
+MAX_SVG_RASTER_PIXELS = 1_000_000
+_SVG_LENGTH_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# On-disk cache of downloaded originals, so reloading the page skips the network
+DOWNLOAD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "placeholder_cache")
+MAX_DOWNLOAD_CACHE_BYTES = 500 * 1024 * 1024
+
 # Page configuration
 st.set_page_config(
     page_title="Image Placeholder Manager",
@@ -30,52 +115,179 @@ st.set_page_config(
     layout="wide"
 )
 
-def extract_image_urls(json_content: str) -> Set[str]:
-    """Extract image URLs from JSON content, handling complex nested structures."""
-    urls = set()
-    
-    # Common image extensions - expanded list
-    image_extensions = r'\.(jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)'
-    
-    # Use the working pattern for escaped URLs (with \/ escaping)
-    escaped_url_pattern = r'https?:\\/\\/[^"\'<>]+\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)'
-    escaped_urls = re.findall(escaped_url_pattern, json_content, re.IGNORECASE)
+@st.cache_data(max_entries=8, show_spinner=False)
+def extract_image_urls_cached(json_content: str) -> frozenset:
+    """Cached extract_image_urls so reruns on the same upload skip the scan."""
+    return frozenset(extract_image_urls(json_content))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_urls_text(urls: frozenset) -> str:
+    """Newline-separated, sorted URL list for the export button (cached per URL set)."""
+    return "\n".join(sorted(urls))
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def pretty_print_json(json_content: str) -> str:
+    """Re-indent JSON text with 2 spaces (cached per upload); raises ValueError if invalid."""
+    non_finite = []
+    tree = json.loads(json_content, parse_constant=lambda c: non_finite.append(c) or float(c))
+    # orjson would write NaN/Infinity as null, so those documents stay on the stdlib
+    if ORJSON_AVAILABLE and not non_finite:
+        try:
+            return orjson.dumps(tree, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass  # Integers beyond 64 bits
+    return json.dumps(tree, indent=2)
+
+def replace_image_urls(text: str, url_map: Dict[str, str]) -> str:
+    """Replace mapped image URLs in one scan of the text, preserving \\/ escaping."""
+    def substitute(match):
+        url = match.group(0)
+        if '\\/' in url:
+            new_url = url_map.get(url.replace('\\/', '/'))
+            return new_url.replace('/', '\\/') if new_url else url
+        return url_map.get(url, url)
     
-    # Clean up escaped URLs by replacing \/ with /
-    cleaned_escaped_urls = [url.replace('\\/', '/') for url in escaped_urls]
+    # Nothing to rewrite: skip the scan entirely
+    if not url_map:
+        return text
     
-    # Also try direct URLs (without escaping)
-    direct_url_pattern = r'https?://[^"\'<>\s]+(?:' + image_extensions + ')'
-    direct_urls = re.findall(direct_url_pattern, json_content, re.IGNORECASE)
+    # Every extracted URL is a _URL_RE match, so one pass with a dict lookup
+    # replaces them all regardless of how many URLs there are
+    return _URL_MATCHER.sub(substitute, text)
+
+def extract_image_urls(json_content: str) -> Set[str]:
+    """Extract image URLs from JSON content, handling complex nested structures."""
+    # Every match contains a scheme separator; skip the regex scan when there is none
+    if '://' not in json_content and ':\\/\\/' not in json_content:
+        return set()
     
-    # Combine all URLs
-    all_urls = cleaned_escaped_urls + direct_urls
+    urls = set()
+    for match in _URL_MATCHER.finditer(json_content):
+        url = match.group(0)
+        # Unescape JSON-encoded slashes (\/ -> /)
+        if '\\/' in url:
+            url = url.replace('\\/', '/')
+        urls.add(url)
     
-    # Clean and validate URLs
-    clean_urls = set()
-    for url in all_urls:
-        # Remove any trailing characters that might not be part of the URL
-        url = re.sub(r'["\',;}\]]+$', '', url)
-        # Validate URL format
-        if re.match(r'https?://.+\..+', url):
-            clean_urls.add(url)
+    return urls
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Return a shared HTTP session whose connection pool is reused across downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def read_response_body(response: requests.Response, max_bytes: int) -> Optional[bytes]:
+    """Read a streamed response body, returning None if it exceeds max_bytes."""
+    # Reject early when the server announces an oversized body
+    content_length = int(response.headers.get('content-length') or 0)
+    if content_length > max_bytes:
+        return None
     
-    return clean_urls
+    # Content-Length may be missing or wrong, so enforce the cap while reading
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        total += len(chunk)
+        if total > max_bytes:
+            return None
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+def _download_cache_path(url: str) -> str:
+    """Path of the on-disk cache entry for a URL."""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(DOWNLOAD_CACHE_DIR, f"{key}.bin")
+
+def read_cached_download(url: str) -> Optional[bytes]:
+    """Return previously downloaded bytes for a URL, or None if not cached."""
+    path = _download_cache_path(url)
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+        # Touch the entry so eviction removes least recently used files first
+        os.utime(path)
+        return content
+    except OSError:
+        return None
 
-def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
-    """Download and return PIL Image from URL with format info."""
+def write_cached_download(url: str, content: bytes) -> None:
+    """Store downloaded bytes in the disk cache atomically (temp file + rename)."""
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=DOWNLOAD_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, _download_cache_path(url))
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        # The cache is best-effort; a failed write just means a later re-download
+        pass
+
+def prune_download_cache(max_bytes: int = MAX_DOWNLOAD_CACHE_BYTES) -> None:
+    """Evict least recently used cache entries until the cache fits in max_bytes."""
+    try:
+        entries = []
+        total = 0
+        with os.scandir(DOWNLOAD_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.bin'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
         
-        content_type = response.headers.get('content-type', '').lower()
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+    except OSError:
+        pass
+
+def get_image_from_url(url: str, session: Optional[requests.Session] = None) -> Optional[Tuple[Image.Image, str, bytes]]:
+    """Download and return PIL Image from URL with format info and the original bytes."""
+    try:
+        content = read_cached_download(url)
+        if content is not None:
+            # No response headers for cached entries, so sniff the markup instead
+            is_svg = url.lower().endswith('.svg') or b'<svg' in content[:1024].lower()
+        else:
+            response = (session or requests).get(url, timeout=(3, 10), stream=True)
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get('content-type', '').lower()
+                # Error and login pages often come back as 200 HTML; skip them unread
+                if content_type.startswith('text/html'):
+                    st.error(f"Not an image (server returned HTML): {url}")
+                    return None
+                is_svg = url.lower().endswith('.svg') or 'svg' in content_type
+                content = read_response_body(response, MAX_SVG_BYTES if is_svg else MAX_IMAGE_BYTES)
+            finally:
+                # Return the connection to the pool as soon as the body is read
+                response.close()
+            
+            if content is None:
+                st.error(f"Image exceeds size limit: {url}")
+                return None
+            
+            write_cached_download(url, content)
         
         # Check if it's an SVG file
-        if url.lower().endswith('.svg') or 'svg' in content_type:
+        if is_svg:
             if CAIROSVG_AVAILABLE:
                 try:
                     # Try to get SVG dimensions
-                    svg_content = response.content
+                    svg_content = content
                     
                     # Parse SVG to get width/height
                     import xml.etree.ElementTree as ET
@@ -84,9 +296,11 @@ def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
                         width = root.get('width', '400')
                         height = root.get('height', '300')
                         
-                        # Remove 'px' or other units and extract numbers
-                        width = int(re.sub(r'[^\d]', '', str(width)) or 400)
-                        height = int(re.sub(r'[^\d]', '', str(height)) or 300)
+                        # Take the leading number, dropping 'px' or other units
+                        width_match = _SVG_LENGTH_RE.search(str(width))
+                        height_match = _SVG_LENGTH_RE.search(str(height))
+                        width = int(float(width_match.group())) if width_match else 400
+                        height = int(float(height_match.group())) if height_match else 300
                         
                         # Ensure reasonable dimensions
                         width = max(100, min(width, 2000))
@@ -94,6 +308,11 @@ def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
                     except:
                         width, height = 400, 300
                     
+                    # Scale large rasters down to the pixel budget
+                    scale = (MAX_SVG_RASTER_PIXELS / (width * height)) ** 0.5
+                    if scale < 1:
+                        width, height = int(width * scale), int(height * scale)
+                    
                     # Convert SVG to PNG with proper dimensions
                     png_data = cairosvg.svg2png(
                         bytestring=svg_content,
@@ -101,17 +320,17 @@ def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
                         output_height=height
                     )
                     img = Image.open(io.BytesIO(png_data))
-                    return img, 'SVG'
+                    return img, 'SVG', content
                     
                 except Exception as svg_error:
                     st.warning(f"SVG conversion error for {url}: {str(svg_error)}")
-                    return create_placeholder(400, 300, "#CCCCCC", add_text=True), 'SVG'
+                    return get_svg_fallback_image(), 'SVG', content
             else:
                 st.info(f"SVG detected but cairosvg not available: {url}")
-                return create_placeholder(400, 300, "#CCCCCC", add_text=True), 'SVG'
+                return get_svg_fallback_image(), 'SVG', content
         
         # Handle regular image formats
-        img = Image.open(io.BytesIO(response.content))
+        img = Image.open(io.BytesIO(content))
         
         # Detect actual format from image
         actual_format = img.format or 'JPEG'
@@ -122,7 +341,7 @@ def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
             if img.mode in ('RGBA', 'LA', 'P'):
                 st.info(f"WebP with transparency detected: {url}")
         
-        return img, actual_format
+        return img, actual_format, content
             
     except requests.RequestException as e:
         st.error(f"Network error: {url} - {str(e)}")
@@ -131,16 +350,99 @@ def get_image_from_url(url: str) -> Optional[Tuple[Image.Image, str]]:
         st.error(f"Error loading: {url} - {str(e)}")
         return None
 
+def make_preview(img: Image.Image, format_info: str, content: bytes) -> bytes:
+    """Encode a small preview for the image grids, so reruns only serve stored bytes."""
+    # Small rasters are shown as downloaded; GIFs too, to keep animation
+    if format_info == 'GIF' or (format_info != 'SVG' and max(img.size) <= PREVIEW_MAX_SIZE):
+        return content
+    try:
+        preview = img.copy() if format_info == 'SVG' else Image.open(io.BytesIO(content))
+        preview.draft('RGB', (PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))  # JPEGs decode at a reduced scale
+        preview.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+        if preview.mode in ('RGBA', 'LA', 'P') or 'transparency' in preview.info:
+            return image_to_bytes(preview, 'PNG', png_compression=1, optimize=False)
+        return image_to_bytes(preview, 'JPEG', quality=80, optimize=False)
+    except Exception:
+        return content if format_info != 'SVG' else image_to_bytes(img, 'PNG')
+
+def load_image(url: str, session: Optional[requests.Session] = None) -> Optional[Dict]:
+    """Download one image and build its preview; runs on a download worker thread."""
+    result = get_image_from_url(url, session)
+    if not result:
+        return None
+    img, format_info, original_bytes = result
+    return {
+        'image': img,
+        'format': format_info,
+        'bytes': original_bytes,
+        'preview': make_preview(img, format_info, original_bytes)
+    }
+
+def load_images(urls: List[str], progress_bar, status_text,
+                max_total_bytes: Optional[int] = None) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """Download images in parallel, updating the progress widgets as each one finishes.
+    
+    Once the downloaded originals would exceed max_total_bytes, the remaining
+    downloads are cancelled and reported as skipped.
+    """
+    images_data = {}
+    failed_downloads = {}
+    total_bytes = 0
+    limit_reached = False
+    if not urls:
+        return images_data, failed_downloads
+    
+    session = get_http_session()
+    # Attach the script context to worker threads so st.* messages still render
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=MAX_DOWNLOAD_WORKERS,
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx)
+    ) as executor:
+        futures = {executor.submit(load_image, url, session): url for url in urls}
+        # Refresh the progress widgets at most ~100 times; each update is a frontend message
+        update_every = max(1, len(urls) // 100)
+        for idx, future in enumerate(as_completed(futures)):
+            url = futures[future]
+            skipped = future.cancelled()
+            img_data = None if skipped else future.result()
+            if img_data and max_total_bytes and total_bytes + len(img_data['bytes']) > max_total_bytes:
+                if not limit_reached:
+                    # Stop the downloads that haven't started yet
+                    limit_reached = True
+                    for pending in futures:
+                        pending.cancel()
+                skipped = True
+                img_data = None
+            
+            if img_data:
+                images_data[url] = img_data
+                total_bytes += len(img_data['bytes'])
+            elif skipped:
+                failed_downloads[url] = "Skipped: total size limit reached"
+            else:
+                failed_downloads[url] = "Failed to load image"
+            if (idx + 1) % update_every == 0 or idx + 1 == len(urls):
+                status_text.text(f"Loaded image {idx + 1} of {len(urls)}: {get_filename_from_url(url)}")
+                progress_bar.progress((idx + 1) / len(urls))
+    
+    prune_download_cache()
+    return images_data, failed_downloads
+
+@functools.lru_cache(maxsize=8192)
 def get_filename_from_url(url: str) -> str:
     """Extract filename from URL, handling edge cases."""
+    # hash() is salted per process, so derive fallback names from a stable digest
+    fallback = f"image_{hashlib.blake2b(url.encode('utf-8'), digest_size=5).hexdigest()}.jpg"
     try:
         parsed = urlparse(url)
         filename = parsed.path.split('/')[-1]
         if not filename or '.' not in filename:
-            return f"image_{hash(url) % 10000}.jpg"
+            return fallback
         return filename
     except:
-        return f"image_{hash(url) % 10000}.jpg"
+        return fallback
 
 
 def generate_placeholder_filename(original_filename: str, pattern: str, prefix: str, index: int = 1) -> str:
@@ -180,61 +482,105 @@ def generate_placeholder_filename(original_filename: str, pattern: str, prefix:
     # Default fallback
     return f"placeholder_{name}.png"
 
-def create_placeholder(width: int, height: int, color: str, add_text: bool = True) -> Image.Image:
-    """Create a placeholder image with specified dimensions and color."""
-    # Create image with solid color
-    img = Image.new('RGB', (width, height), color)
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_placeholder_names(urls_text: str, pattern: str, prefix: str) -> Dict[str, str]:
+    """Name each URL's placeholder, numbered in list order (cached per URL list and naming settings).
     
-    if add_text:
+    URLs arrive newline-joined: one string hashes far faster than a tuple of thousands.
+    """
+    return {
+        url: generate_placeholder_filename(get_filename_from_url(url), pattern, prefix, i + 1)
+        for i, url in enumerate(urls_text.split('\n'))
+    }
+
+def get_placeholder_names() -> Dict[str, str]:
+    """Placeholder filenames for the current URLs and naming settings, shared by the ZIP, gallery and JSON updater."""
+    return build_placeholder_names(
+        "\n".join(st.session_state.image_urls),
+        st.session_state.get('naming_pattern', 'original_filename'),
+        st.session_state.get('custom_prefix', '')
+    )
+
+def build_url_map(placeholder_names: Dict[str, str], base_url: str) -> Dict[str, str]:
+    """Map each original URL to its hosted placeholder URL."""
+    url_root = base_url.rstrip('/') + '/'
+    return {url: url_root + name for url, name in placeholder_names.items()}
+
+@st.cache_resource(max_entries=32)
+def get_font(font_size: int) -> ImageFont.ImageFont:
+    """Load the placeholder font once per size and keep it across reruns."""
+    try:
+        # Try to use a default font
+        return ImageFont.truetype("Arial.ttf", font_size)
+    except:
+        try:
+            return ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
+        except:
+            return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=64)
+def parse_color(color: str) -> Tuple[int, ...]:
+    """Parse a color string to an RGB tuple once per distinct color."""
+    return ImageColor.getrgb(color)
+
+@functools.lru_cache(maxsize=256)
+def measure_text(text: str, font_size: int) -> Tuple[int, int]:
+    """Width and line height of text in the placeholder font, via direct metric lookups."""
+    font = get_font(font_size)
+    if isinstance(font, ImageFont.FreeTypeFont):
+        ascent, descent = font.getmetrics()
+        return int(font.getlength(text)), ascent + descent
+    
+    # The bitmap fallback font has no metrics API, so measure its bounding box
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+@functools.lru_cache(maxsize=64)
+def text_palette(background: Tuple[int, ...], text_color: Tuple[int, ...]) -> List[int]:
+    """Palette ramping linearly from the background (index 0) to the text color (index 255)."""
+    return [round(bg + (fg - bg) * i / 255) for i in range(256) for bg, fg in zip(background, text_color)]
+
+def create_placeholder(width: int, height: int, color: str, text: str = "Placeholder") -> Image.Image:
+    """Create a placeholder image with specified dimensions and color, and optional centered text.
+    
+    Text is drawn as coverage into a single-band image that is then mapped through
+    text_palette, so anti-aliased edges match an RGB drawing pixel for pixel while
+    the image takes a third of the memory and encodes to a much smaller PNG.
+    """
+    rgb = parse_color(color)
+    # Contrasting text color, white on any dark background
+    luma = 0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2]
+    text_color = (255, 255, 255) if luma < 128 else (0, 0, 0)
+    
+    img = Image.new('L', (width, height), 0)
+    
+    if text:
         draw = ImageDraw.Draw(img)
-        text = "Placeholder"
         
         # Calculate font size based on image dimensions
         font_size = min(width, height) // 10
         font_size = max(20, min(font_size, 100))  # Clamp between 20 and 100
+        font_size = 4 * round(font_size / 4)  # Bucket so near-identical sizes share a font
         
-        try:
-            # Try to use a default font
-            font = ImageFont.truetype("Arial.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-        
-        # Get text bounding box
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        font = get_font(font_size)
+        text_width, text_height = measure_text(text, font_size)
         
         # Center the text
         x = (width - text_width) // 2
         y = (height - text_height) // 2
         
-        # Draw text with contrasting color
-        text_color = "white" if color.lower() in ["black", "#000000", "#000"] else "black"
-        draw.text((x, y), text, fill=text_color, font=font)
+        draw.text((x, y), text, fill=255, font=font)
     
+    img = img.convert('P')
+    img.putpalette(text_palette(rgb[:3], text_color))
     return img
 
-def get_image_format_from_image(img: Image.Image, url: str) -> str:
-    """Get format from actual image object, fallback to URL."""
-    if img.format:
-        return img.format
-    
-    # Fallback to URL extension
-    url_lower = url.lower()
-    if '.png' in url_lower:
-        return 'PNG'
-    elif '.webp' in url_lower:
-        return 'WEBP'
-    elif '.gif' in url_lower:
-        return 'GIF'
-    else:
-        return 'JPEG'
-
-def image_to_bytes(img: Image.Image, format: str = None, quality: int = 85, png_compression: int = 6) -> bytes:
-    """Convert PIL Image to bytes with proper format handling."""
+def image_to_bytes(img: Image.Image, format: str = None, quality: int = 85, png_compression: int = 6,
+                   optimize: bool = True) -> bytes:
+    """Convert PIL Image to bytes with proper format handling.
+    
+    PNG optimize=True searches for the smallest encoding and overrides png_compression.
+    """
     img_bytes = io.BytesIO()
     
     # Default to PNG if no format or SVG
@@ -245,12 +591,12 @@ def image_to_bytes(img: Image.Image, format: str = None, quality: int = 85, png_
     if format.upper() == 'WEBP':
         if img.mode in ('RGBA', 'LA'):
             # Keep as PNG to preserve transparency
-            img.save(img_bytes, format='PNG', compress_level=png_compression, optimize=True)
+            img.save(img_bytes, format='PNG', compress_level=png_compression, optimize=optimize)
         else:
             # Can convert to JPEG for smaller size
             if img.mode != 'RGB':
                 img = img.convert('RGB')
-            img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
+            img.save(img_bytes, format='JPEG', quality=quality, optimize=optimize)
     
     # JPEG handling - remove transparency
     elif format.upper() == 'JPEG':
@@ -259,15 +605,15 @@ def image_to_bytes(img: Image.Image, format: str = None, quality: int = 85, png_
             rgb_img = Image.new("RGB", img.size, (255, 255, 255))
             if img.mode == 'P':
                 img = img.convert('RGBA')
-            rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+            rgb_img.paste(img, mask=img.getchannel('A') if img.mode in ('RGBA', 'LA') else None)
             img = rgb_img
         elif img.mode != 'RGB':
             img = img.convert('RGB')
-        img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
+        img.save(img_bytes, format='JPEG', quality=quality, optimize=optimize)
     
     # PNG handling
     elif format.upper() == 'PNG':
-        img.save(img_bytes, format='PNG', compress_level=png_compression, optimize=True)
+        img.save(img_bytes, format='PNG', compress_level=png_compression, optimize=optimize)
     
     # Other formats
     else:
@@ -275,26 +621,175 @@ def image_to_bytes(img: Image.Image, format: str = None, quality: int = 85, png_
     
     return img_bytes.getvalue()
 
-def create_zip_file(files: Dict[str, bytes]) -> bytes:
+@st.cache_resource
+def _svg_fallback_image() -> Image.Image:
+    """Render the generic SVG stand-in once; it is identical for every SVG."""
+    return create_placeholder(400, 300, "#CCCCCC")
+
+def get_svg_fallback_image() -> Image.Image:
+    """Return a private copy of the shared SVG stand-in image."""
+    return _svg_fallback_image().copy()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_placeholder_png(width: int, height: int, color: str, text: str,
+                           png_compression: int = 6, optimize: bool = False) -> bytes:
+    """Render a placeholder as PNG bytes, memoized since many images share dimensions."""
+    placeholder = create_placeholder(width, height, color, text)
+    if not text:
+        # Only palette index 0 is used, so a 1-bit PNG holds the same image in an
+        # eighth of the raw data
+        img_bytes = io.BytesIO()
+        placeholder.save(img_bytes, format='PNG', bits=1, compress_level=png_compression, optimize=optimize)
+        return img_bytes.getvalue()
+    return image_to_bytes(placeholder, "PNG", png_compression=png_compression, optimize=optimize)
+
+def get_mime_type(format_info: str) -> str:
+    """Return the MIME type for a detected image format."""
+    return 'image/svg+xml' if format_info == 'SVG' else f"image/{format_info.lower()}"
+
+def create_zip_file(files: Dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED,
+                    compresslevel: Optional[int] = None) -> bytes:
     """Create a ZIP file from a dictionary of filename: content pairs."""
     zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    with zipfile.ZipFile(zip_buffer, 'w', compression, compresslevel=compresslevel) as zip_file:
         for filename, content in files.items():
             zip_file.writestr(filename, content)
     return zip_buffer.getvalue()
 
-def get_json_files() -> List[str]:
-    """Get list of JSON files from the json directory."""
-    json_dir = os.path.join(os.getcwd(), "json")
-    if not os.path.exists(json_dir):
-        return []
+@_fragment
+def render_gallery():
+    """Render the per-image download grid; its own widgets rerun only this fragment."""
+    # Individual image downloads
+    st.subheader("🖼️ Individual Downloads")
     
-    json_files = []
-    for file in os.listdir(json_dir):
-        if file.endswith('.json'):
-            json_files.append(file)
+    # Comparison view toggle
+    show_comparison = st.checkbox("Show Side-by-Side Comparison")
     
-    return sorted(json_files)
+    if st.session_state.images_data:
+        # Display images in grid
+        urls_list = list(st.session_state.image_urls)
+        per_row = 2 if show_comparison else 4
+        
+        # Paginate so each rerun renders one page of tiles, not every image
+        if len(urls_list) > GALLERY_PAGE_SIZE:
+            page_count = -(-len(urls_list) // GALLERY_PAGE_SIZE)
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+            urls_list = urls_list[(page - 1) * GALLERY_PAGE_SIZE:page * GALLERY_PAGE_SIZE]
+        
+        # Same names as the placeholders ZIP and the updated JSON
+        placeholder_filenames = get_placeholder_names()
+        
+        for i in range(0, len(urls_list), per_row):
+            # Widget keys come from the URL so they stay stable across reruns and layouts
+            if show_comparison:
+                cols = st.columns(2)
+                for col, url in zip(cols, urls_list[i:i + per_row]):
+                    img_data = st.session_state.images_data.get(url)
+                    
+                    if img_data:
+                        img = img_data['image']
+                        with col:
+                            # Side-by-side comparison
+                            comp_col1, comp_col2 = st.columns(2)
+                            with comp_col1:
+                                st.image(img_data['preview'], caption="Original", use_container_width=True)
+                            with comp_col2:
+                                if url in st.session_state.placeholders_data:
+                                    placeholder = st.session_state.placeholders_data[url]
+                                    st.image(placeholder, caption="Placeholder", use_container_width=True)
+                                else:
+                                    st.info("Generate placeholder first")
+                            
+                            # Download buttons
+                            filename = get_filename_from_url(url)
+                            st.caption(f"**{filename}** - {img.width}×{img.height}")
+                            
+                            # Three download buttons
+                            btn_col1, btn_col2, btn_col3 = st.columns(3)
+                            
+                            with btn_col1:
+                                format_info = img_data['format']
+                                original_bytes = img_data['bytes']
+                                st.download_button(
+                                    label="📥 Original",
+                                    data=original_bytes,
+                                    file_name=filename,
+                                    mime=get_mime_type(format_info),
+                                    key=f"orig_comp_{url}"
+                                )
+                            
+                            with btn_col2:
+                                st.link_button(
+                                    label="🌐 Remote",
+                                    url=url,
+                                    help="Open original image URL"
+                                )
+                            
+                            with btn_col3:
+                                if url in st.session_state.placeholders_data:
+                                    placeholder_bytes = st.session_state.placeholders_data[url]
+                                    st.download_button(
+                                        label="📥 Placeholder",
+                                        data=placeholder_bytes,
+                                        file_name=placeholder_filenames[url],
+                                        mime="image/png",
+                                        key=f"place_comp_{url}"
+                                    )
+                                else:
+                                    st.button("Generate First", disabled=True, key=f"disabled_comp_{url}")
+            else:
+                # Regular grid view (4 per row)
+                cols = st.columns(4)
+                for col, url in zip(cols, urls_list[i:i + per_row]):
+                    img_data = st.session_state.images_data.get(url)
+                    
+                    if img_data:
+                        img = img_data['image']
+                        with col:
+                            # Display image
+                            st.image(img_data['preview'], use_container_width=True)
+                            
+                            # Filename and info
+                            filename = get_filename_from_url(url)
+                            st.caption(f"**{filename}**")
+                            st.caption(f"Size: {img.width}x{img.height}")
+                            
+                            # Three download buttons
+                            btn_col1, btn_col2, btn_col3 = st.columns(3)
+                            
+                            with btn_col1:
+                                format_info = img_data['format']
+                                original_bytes = img_data['bytes']
+                                st.download_button(
+                                    label="📥 Orig",
+                                    data=original_bytes,
+                                    file_name=filename,
+                                    mime=get_mime_type(format_info),
+                                    key=f"orig_{url}",
+                                    help="Download original image"
+                                )
+                            
+                            with btn_col2:
+                                st.link_button(
+                                    label="🌐 URL",
+                                    url=url,
+                                    help="Open original image URL"
+                                )
+                            
+                            with btn_col3:
+                                if url in st.session_state.placeholders_data:
+                                    placeholder_bytes = st.session_state.placeholders_data[url]
+                                    st.download_button(
+                                        label="📥 Place",
+                                        data=placeholder_bytes,
+                                        file_name=placeholder_filenames[url],
+                                        mime="image/png",
+                                        key=f"place_{url}",
+                                        help="Download placeholder image"
+                                    )
+                                else:
+                                    st.button("Gen First", disabled=True, key=f"disabled_{url}", help="Generate placeholder first")
+
 
 def main():
     st.title("🖼️ Image Placeholder Manager")
@@ -361,23 +856,22 @@ def main():
                 st.info(f"**{selected_file_name}** - {file_size / (1024*1024):.1f}MB")
                 
                 # Extract image URLs
-                urls = extract_image_urls(json_content)
+                urls = extract_image_urls_cached(json_content)
                 
                 if urls:
                     # Only process if this is a new upload/file
                     if st.session_state.processed_file_name != selected_file_name:
                         # Reset previous state when a new file is uploaded
-                        st.session_state.image_urls = urls
+                        st.session_state.image_urls = set(urls)
                         st.session_state.images_data = {}
                         st.session_state.placeholders_data = {}
                         st.session_state.failed_downloads = {}
                         st.success(f"Found {len(urls)} unique image URLs")
                         
                         # Export URLs button
-                        urls_text = "\n".join(sorted(urls))
                         st.download_button(
                             label="📄 Export URLs to Text File",
-                            data=urls_text,
+                            data=get_urls_text(urls),
                             file_name="extracted_image_urls.txt",
                             mime="text/plain",
                             help="Download all extracted image URLs as a text file"
@@ -388,18 +882,12 @@ def main():
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
-                        for idx, url in enumerate(urls_list):
-                            status_text.text(f"Loading image {idx + 1} of {len(urls_list)}: {get_filename_from_url(url)}")
-                            result = get_image_from_url(url)
-                            if result:
-                                img, format_info = result
-                                st.session_state.images_data[url] = {
-                                    'image': img,
-                                    'format': format_info
-                                }
-                            else:
-                                st.session_state.failed_downloads[url] = "Failed to load image"
-                            progress_bar.progress((idx + 1) / len(urls_list))
+                        images_data, failed_downloads = load_images(
+                            urls_list, progress_bar, status_text,
+                            st.session_state.get('max_total_size', 200) * 1024 * 1024
+                        )
+                        st.session_state.images_data = images_data
+                        st.session_state.failed_downloads = failed_downloads
                         
                         status_text.text("All images loaded successfully!")
                         st.success(f"Loaded {len(st.session_state.images_data)} images successfully")
@@ -423,7 +911,7 @@ def main():
                                         if img_data:
                                             img = img_data['image']
                                             with col:
-                                                st.image(img, use_container_width=True)
+                                                st.image(img_data['preview'], use_container_width=True)
                                                 filename = get_filename_from_url(url)
                                                 st.caption(f"**{filename}**")
                         
@@ -456,21 +944,12 @@ def main():
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                st.session_state.images_data = {}
-                st.session_state.failed_downloads = {}
-                
-                for idx, url in enumerate(urls):
-                    status_text.text(f"Loading image {idx + 1} of {len(urls)}: {get_filename_from_url(url)}")
-                    result = get_image_from_url(url)
-                    if result:
-                        img, format_info = result
-                        st.session_state.images_data[url] = {
-                            'image': img,
-                            'format': format_info
-                        }
-                    else:
-                        st.session_state.failed_downloads[url] = "Failed to load image"
-                    progress_bar.progress((idx + 1) / len(urls))
+                images_data, failed_downloads = load_images(
+                    urls, progress_bar, status_text,
+                    st.session_state.get('max_total_size', 200) * 1024 * 1024
+                )
+                st.session_state.images_data = images_data
+                st.session_state.failed_downloads = failed_downloads
                 
                 status_text.text("✅ Loading complete!")
                 st.success(f"Loaded {len(st.session_state.images_data)} images successfully")
@@ -485,10 +964,17 @@ def main():
                 
                 # Show image statistics
                 if st.session_state.images_data:
-                    total_size_mb = sum(len(image_to_bytes(img_data['image'])) for img_data in st.session_state.images_data.values()) / (1024 * 1024)
-                    avg_width = sum(img_data['image'].width for img_data in st.session_state.images_data.values()) // len(st.session_state.images_data)
-                    avg_height = sum(img_data['image'].height for img_data in st.session_state.images_data.values()) // len(st.session_state.images_data)
-                    unique_formats = set(img_data['format'] for img_data in st.session_state.images_data.values())
+                    # Single pass over already-known values; no re-encoding needed
+                    total_bytes = total_width = total_height = 0
+                    unique_formats = set()
+                    for img_data in st.session_state.images_data.values():
+                        total_bytes += len(img_data['bytes'])
+                        total_width += img_data['image'].width
+                        total_height += img_data['image'].height
+                        unique_formats.add(img_data['format'])
+                    total_size_mb = total_bytes / (1024 * 1024)
+                    avg_width = total_width // len(st.session_state.images_data)
+                    avg_height = total_height // len(st.session_state.images_data)
                     
                     col1, col2, col3, col4 = st.columns(4)
                     col1.metric("Total Images", len(st.session_state.images_data))
@@ -510,17 +996,25 @@ def main():
                 if st.button("Generate Placeholders", type="primary"):
                     with st.spinner("Generating placeholders..."):
                         st.session_state.placeholders_data = {}
+                        png_compression = st.session_state.get('png_compression', 6)
+                        optimize_png = st.session_state.get('optimize_png', False)
+                        # Render each distinct size once, in parallel; images of the same size
+                        # share one bytes object instead of each paying a cache lookup and copy
+                        sizes = list({img_data['image'].size for img_data in st.session_state.images_data.values()})
+                        with ThreadPoolExecutor(
+                            max_workers=MAX_RENDER_WORKERS,
+                            initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())
+                        ) as executor:
+                            rendered = dict(zip(sizes, executor.map(
+                                lambda size: render_placeholder_png(
+                                    size[0], size[1], placeholder_color, placeholder_text,
+                                    png_compression, optimize_png
+                                ),
+                                sizes
+                            )))
                         for url, img_data in st.session_state.images_data.items():
-                            img = img_data['image']
-                            placeholder = create_placeholder(
-                                img.width, img.height, placeholder_color, add_text=bool(placeholder_text)
-                            )
-                            # Update placeholder text if custom text provided
-                            if placeholder_text != "Placeholder":
-                                placeholder = create_placeholder_with_custom_text(
-                                    img.width, img.height, placeholder_color, placeholder_text
-                                )
-                            st.session_state.placeholders_data[url] = placeholder
+                            st.session_state.placeholders_data[url] = rendered[img_data['image'].size]
                         st.success("Placeholders generated successfully!")
         else:
             st.info("Please upload and process a JSON file first in the Upload tab.")
@@ -541,12 +1035,12 @@ def main():
                         with st.spinner("Creating ZIP file..."):
                             files = {}
                             for url, img_data in st.session_state.images_data.items():
-                                img = img_data['image']
-                                format_info = img_data['format']
+                                # Originals are zipped as downloaded, without re-encoding
                                 filename = get_filename_from_url(url)
-                                files[filename] = image_to_bytes(img, format_info)
+                                files[filename] = img_data['bytes']
                             
-                            zip_data = create_zip_file(files)
+                            # Originals are already compressed; store them as-is
+                            zip_data = create_zip_file(files, zipfile.ZIP_STORED)
                             st.download_button(
                                 label="📥 Download Originals ZIP",
                                 data=zip_data,
@@ -557,15 +1051,14 @@ def main():
                 with col2:
                     if st.button("Download All Placeholders (ZIP)"):
                         with st.spinner("Creating ZIP file..."):
-                            files = {}
-                            naming_pattern = st.session_state.get('naming_pattern', 'original_filename')
-                            custom_prefix = st.session_state.get('custom_prefix', '')
-                            for i, (url, placeholder) in enumerate(st.session_state.placeholders_data.items()):
-                                original_filename = get_filename_from_url(url)
-                                placeholder_filename = generate_placeholder_filename(original_filename, naming_pattern, custom_prefix, i+1)
-                                files[placeholder_filename] = image_to_bytes(placeholder, "PNG")
+                            placeholder_names = get_placeholder_names()
+                            files = {
+                                placeholder_names[url]: placeholder
+                                for url, placeholder in st.session_state.placeholders_data.items()
+                            }
                             
-                            zip_data = create_zip_file(files)
+                            # Flat-color placeholders still deflate well, so use a fast level
+                            zip_data = create_zip_file(files, zipfile.ZIP_DEFLATED, compresslevel=1)
                             st.download_button(
                                 label="📥 Download Placeholders ZIP",
                                 data=zip_data,
@@ -573,139 +1066,7 @@ def main():
                                 mime="application/zip"
                             )
             
-            # Individual image downloads
-            st.subheader("🖼️ Individual Downloads")
-            
-            # Comparison view toggle
-            show_comparison = st.checkbox("Show Side-by-Side Comparison")
-            
-            if st.session_state.images_data:
-                # Display images in grid
-                urls_list = list(st.session_state.image_urls)
-                
-                for i in range(0, len(urls_list), 2 if show_comparison else 4):
-                    if show_comparison:
-                        cols = st.columns(2)
-                        for j, col in enumerate(cols):
-                            if i + j < len(urls_list):
-                                url = urls_list[i + j]
-                                img_data = st.session_state.images_data.get(url)
-                                
-                                if img_data:
-                                    img = img_data['image']
-                                    with col:
-                                        # Side-by-side comparison
-                                        comp_col1, comp_col2 = st.columns(2)
-                                        with comp_col1:
-                                            st.image(img, caption="Original", use_container_width=True)
-                                        with comp_col2:
-                                            if url in st.session_state.placeholders_data:
-                                                placeholder = st.session_state.placeholders_data[url]
-                                                st.image(placeholder, caption="Placeholder", use_container_width=True)
-                                            else:
-                                                st.info("Generate placeholder first")
-                                        
-                                        # Download buttons
-                                        filename = get_filename_from_url(url)
-                                        st.caption(f"**{filename}** - {img.width}×{img.height}")
-                                        
-                                        # Three download buttons
-                                        btn_col1, btn_col2, btn_col3 = st.columns(3)
-                                        
-                                        with btn_col1:
-                                            format_info = img_data['format']
-                                            original_bytes = image_to_bytes(img, format_info)
-                                            st.download_button(
-                                                label="📥 Original",
-                                                data=original_bytes,
-                                                file_name=filename,
-                                                mime=f"image/{format_info.lower()}",
-                                                key=f"orig_comp_{i}_{j}"
-                                            )
-                                        
-                                        with btn_col2:
-                                            st.link_button(
-                                                label="🌐 Remote",
-                                                url=url,
-                                                help="Open original image URL"
-                                            )
-                                        
-                                        with btn_col3:
-                                            if url in st.session_state.placeholders_data:
-                                                placeholder = st.session_state.placeholders_data[url]
-                                                placeholder_bytes = image_to_bytes(placeholder, "PNG")
-                                                # Use new naming pattern function
-                                                naming_pattern = st.session_state.get('naming_pattern', 'original_filename')
-                                                custom_prefix = st.session_state.get('custom_prefix', '')
-                                                placeholder_filename = generate_placeholder_filename(filename, naming_pattern, custom_prefix, i*4+j+1)
-                                                st.download_button(
-                                                    label="📥 Placeholder",
-                                                    data=placeholder_bytes,
-                                                    file_name=placeholder_filename,
-                                                    mime="image/png",
-                                                    key=f"place_comp_{i}_{j}"
-                                                )
-                                            else:
-                                                st.button("Generate First", disabled=True, key=f"disabled_comp_{i}_{j}")
-                    else:
-                        # Regular grid view (4 per row)
-                        cols = st.columns(4)
-                        for j, col in enumerate(cols):
-                            if i + j < len(urls_list):
-                                url = urls_list[i + j]
-                                img_data = st.session_state.images_data.get(url)
-                                
-                                if img_data:
-                                    img = img_data['image']
-                                    with col:
-                                        # Display image
-                                        st.image(img, use_container_width=True)
-                                        
-                                        # Filename and info
-                                        filename = get_filename_from_url(url)
-                                        st.caption(f"**{filename}**")
-                                        st.caption(f"Size: {img.width}x{img.height}")
-                                        
-                                        # Three download buttons
-                                        btn_col1, btn_col2, btn_col3 = st.columns(3)
-                                        
-                                        with btn_col1:
-                                            format_info = img_data['format']
-                                            original_bytes = image_to_bytes(img, format_info)
-                                            st.download_button(
-                                                label="📥 Orig",
-                                                data=original_bytes,
-                                                file_name=filename,
-                                                mime=f"image/{format_info.lower()}",
-                                                key=f"orig_{i}_{j}",
-                                                help="Download original image"
-                                            )
-                                        
-                                        with btn_col2:
-                                            st.link_button(
-                                                label="🌐 URL",
-                                                url=url,
-                                                help="Open original image URL"
-                                            )
-                                        
-                                        with btn_col3:
-                                            if url in st.session_state.placeholders_data:
-                                                placeholder = st.session_state.placeholders_data[url]
-                                                placeholder_bytes = image_to_bytes(placeholder, "PNG")
-                                                # Use new naming pattern function
-                                                naming_pattern = st.session_state.get('naming_pattern', 'original_filename')
-                                                custom_prefix = st.session_state.get('custom_prefix', '')
-                                                placeholder_filename = generate_placeholder_filename(filename, naming_pattern, custom_prefix, i*4+j+1)
-                                                st.download_button(
-                                                    label="📥 Place",
-                                                    data=placeholder_bytes,
-                                                    file_name=placeholder_filename,
-                                                    mime="image/png",
-                                                    key=f"place_{i}_{j}",
-                                                    help="Download placeholder image"
-                                                )
-                                            else:
-                                                st.button("Gen First", disabled=True, key=f"disabled_{i}_{j}", help="Generate placeholder first")
+            render_gallery()
         else:
             st.info("No images loaded. Please process images first in the Process tab.")
     
@@ -713,95 +1074,97 @@ def main():
         # Settings tab
         st.header("🛠️ Settings")
         
-        # Image optimization settings
-        st.subheader("🎛️ Image Quality Settings")
-        col1, col2 = st.columns(2)
-        with col1:
-            jpeg_quality = st.slider("JPEG Quality", 50, 100, 85, help="Higher values = better quality, larger file size")
-        with col2:
-            png_compression = st.slider("PNG Compression", 0, 9, 6, help="Higher values = smaller file size, slower compression")
-        
-        # Batch rename options
-        st.subheader("📝 Naming Patterns")
-        
-        # Custom prefix input
-        custom_prefix = st.text_input(
-            "Custom Prefix (optional)",
-            value="placeholder_",
-            help="Add a custom prefix to placeholder filenames. Leave empty for no prefix."
-        )
-        
-        naming_pattern = st.selectbox(
-            "Placeholder Naming Pattern",
-            [
-                "original_filename",  # Default: keep original name with prefix
-                "prefix_original_filename", 
-                "original_filename_suffix",
-                "prefix_index_original_filename"
-            ],
-            index=0,  # Default to original filename
-            help="Choose how placeholder files should be named"
-        )
+        # Settings are applied together on submit, so dragging a slider or typing a
+        # prefix doesn't rerun the whole app on every change. Widget keys write the
+        # applied values straight to session state for the other tabs.
+        with st.form("settings_form"):
+            # Image optimization settings
+            st.subheader("🎛️ Image Quality Settings")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.slider("JPEG Quality", 50, 100, 85, key="jpeg_quality",
+                          help="Higher values = better quality, larger file size")
+            with col2:
+                st.slider("PNG Compression", 0, 9, 6, key="png_compression",
+                          help="Higher values = smaller file size, slower compression")
+            st.checkbox("Optimize PNG output", value=False, key="optimize_png",
+                        help="Extra encoding pass for slightly smaller placeholders. Slower; overrides PNG Compression.")
+            
+            # Batch rename options
+            st.subheader("📝 Naming Patterns")
+            
+            # Custom prefix input
+            st.text_input(
+                "Custom Prefix (optional)",
+                value="placeholder_",
+                key="custom_prefix",
+                help="Add a custom prefix to placeholder filenames. Leave empty for no prefix."
+            )
+            
+            st.selectbox(
+                "Placeholder Naming Pattern",
+                [
+                    "original_filename",  # Default: keep original name with prefix
+                    "prefix_original_filename", 
+                    "original_filename_suffix",
+                    "prefix_index_original_filename"
+                ],
+                index=0,  # Default to original filename
+                key="naming_pattern",
+                help="Choose how placeholder files should be named"
+            )
+            
+            # Memory management settings
+            st.subheader("💾 Memory Management")
+            st.slider("Max Image Dimension (pixels)", 500, 4000, 2000, key="max_image_size",
+                      help="Images larger than this will be resized to save memory")
+            st.slider("Max Total Size (MB)", 50, 500, 200, key="max_total_size",
+                      help="Stop loading images when total size exceeds this limit")
+            
+            st.form_submit_button("Apply Settings")
         
-        # Show example of naming pattern
+        # Show example of the applied naming pattern
+        naming_pattern = st.session_state.naming_pattern
+        custom_prefix = st.session_state.custom_prefix
         example_filename = "69555-author.webp"
-        if naming_pattern == "original_filename":
-            if custom_prefix:
-                example_result = f"{custom_prefix}{example_filename}"
-            else:
-                example_result = example_filename
-        elif naming_pattern == "prefix_original_filename":
-            example_result = f"{custom_prefix}{example_filename}" if custom_prefix else example_filename
-        elif naming_pattern == "original_filename_suffix":
-            name, ext = example_filename.rsplit('.', 1) if '.' in example_filename else (example_filename, 'png')
-            suffix = custom_prefix.rstrip('_') if custom_prefix else "placeholder"
-            example_result = f"{name}_{suffix}.{ext}"
-        elif naming_pattern == "prefix_index_original_filename":
-            example_result = f"{custom_prefix}001_{example_filename}" if custom_prefix else f"001_{example_filename}"
+        example_result = generate_placeholder_filename(example_filename, naming_pattern, custom_prefix)
         
         st.info(f"**Example:** `{example_filename}` → `{example_result}`")
         
-        # Memory management settings
-        st.subheader("💾 Memory Management")
-        max_image_size = st.slider("Max Image Dimension (pixels)", 500, 4000, 2000, 
-                                 help="Images larger than this will be resized to save memory")
-        max_total_size = st.slider("Max Total Size (MB)", 50, 500, 200,
-                                 help="Stop loading images when total size exceeds this limit")
-        
-        # Store settings in session state
-        st.session_state.jpeg_quality = jpeg_quality
-        st.session_state.png_compression = png_compression
-        st.session_state.naming_pattern = naming_pattern
-        st.session_state.custom_prefix = custom_prefix
-        st.session_state.max_image_size = max_image_size
-        st.session_state.max_total_size = max_total_size
-        
         # JSON Updater section
         if st.session_state.placeholders_data:
             st.subheader("🔄 JSON Updater")
             st.markdown("Replace original image URLs with placeholder URLs in your JSON.")
             
-            base_url = st.text_input(
-                "Base URL for hosted placeholders",
-                value="https://diviflow.com/placeholder/images/",
-                help="Enter the base URL where your placeholder images will be hosted"
-            )
+            # Submit as a form so typing the base URL doesn't rerun the app per keystroke
+            with st.form("json_updater_form"):
+                base_url = st.text_input(
+                    "Base URL for hosted placeholders",
+                    value="https://diviflow.com/placeholder/images/",
+                    help="Enter the base URL where your placeholder images will be hosted"
+                )
+                reformat_json = st.checkbox(
+                    "Pretty-print updated JSON",
+                    value=False,
+                    help="Re-indent the output. Off keeps the original formatting and is faster for large files."
+                )
+                generate_json = st.form_submit_button("Generate Updated JSON")
             
-            if base_url and st.button("Generate Updated JSON"):
+            if base_url and generate_json:
                 try:
-                    # Parse original JSON from session state
-                    original_json = json.loads(st.session_state.json_content)
-                    updated_json_str = json.dumps(original_json, indent=2)
+                    # Validate the original JSON; URLs are rewritten in the text as-is.
+                    # The parsed tree is dropped right away rather than held through the rewrite.
+                    if reformat_json:
+                        updated_json_str = pretty_print_json(st.session_state.json_content)
+                    else:
+                        json.loads(st.session_state.json_content)
+                        updated_json_str = st.session_state.json_content
+                    
+                    # Map each original URL to its placeholder URL
+                    url_map = build_url_map(get_placeholder_names(), base_url)
                     
-                    # Replace URLs
-                    for i, url in enumerate(st.session_state.image_urls):
-                        filename = get_filename_from_url(url)
-                        # Use new naming pattern function
-                        naming_pattern = st.session_state.get('naming_pattern', 'original_filename')
-                        custom_prefix = st.session_state.get('custom_prefix', '')
-                        placeholder_filename = generate_placeholder_filename(filename, naming_pattern, custom_prefix, i+1)
-                        new_url = base_url.rstrip('/') + '/' + placeholder_filename
-                        updated_json_str = updated_json_str.replace(url, new_url)
+                    # Replace all URLs in a single pass
+                    updated_json_str = replace_image_urls(updated_json_str, url_map)
                     
                     # Display updated JSON
                     st.subheader("Updated JSON")
@@ -820,40 +1183,5 @@ def main():
                 except Exception as e:
                     st.error(f"Error updating JSON: {str(e)}")
 
-def create_placeholder_with_custom_text(width: int, height: int, color: str, text: str) -> Image.Image:
-    """Create a placeholder image with custom text."""
-    # Create image with solid color
-    img = Image.new('RGB', (width, height), color)
-    
-    draw = ImageDraw.Draw(img)
-    
-    # Calculate font size based on image dimensions
-    font_size = min(width, height) // 10
-    font_size = max(20, min(font_size, 100))  # Clamp between 20 and 100
-    
-    try:
-        # Try to use a default font
-        font = ImageFont.truetype("Arial.ttf", font_size)
-    except:
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-    
-    # Get text bounding box
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    # Center the text
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2
-    
-    # Draw text with contrasting color
-    text_color = "white" if color.lower() in ["black", "#000000", "#000"] else "black"
-    draw.text((x, y), text, fill=text_color, font=font)
-    
-    return img
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,102 +1,139 @@
 #!/usr/bin/env python3
 import json
+import logging
 import re
+import sys
 from typing import Set
 
+# Per-node tracing goes to logger.debug, which is skipped cheaply unless the
+# level is enabled (run with -v); stage summaries are logged at INFO
+logger = logging.getLogger(__name__)
+
+# Common image extensions - expanded list. Non-capturing, so findall returns
+# whole URLs rather than just the extension.
+_IMG_EXT = r'\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)'
+
+# Compiled once at import instead of on every string node. Texts have \/
+# escapes undone before matching, so only plain URLs need a pattern.
+# The URL body is capped so a long run of "http://" with no image extension
+# costs linear time; unbounded, every start rescanned the rest of the run.
+_MAX_URL_LENGTH = 2048
+_URL_RE = re.compile(
+    rf'https?://[^\s"\'<>\\]{{1,{_MAX_URL_LENGTH}}}' + _IMG_EXT,
+    re.IGNORECASE
+)
+
+# Any JSON escape other than \/ (which the raw pass undoes before matching)
+_ESCAPE_RE = re.compile(r'\\[^/]')
+
+# Substrings of dict keys that suggest an image URL value
+_IMG_KEYS = ('src', 'url', 'image', 'img', 'background', 'photo', 'picture')
+# One C-level scan per key instead of a generator over the substrings. Matched
+# against the lowercased key: a case-insensitive pattern was slower than any()
+_IMG_KEY_RE = re.compile('|'.join(_IMG_KEYS))
+
+def _discard(*args) -> None:
+    """Stand-in for logger.debug when DEBUG is disabled."""
+
 def extract_image_urls_debug(json_content: str) -> Set[str]:
     """Debug version of extract_image_urls function."""
     urls = set()
+    # Bound once: with DEBUG off, per-node trace calls skip the logging machinery
+    tracing = logger.isEnabledFor(logging.DEBUG)
+    trace = logger.debug if tracing else _discard
     
-    # Common image extensions - expanded list
-    image_extensions = r'\.(jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)'
-    
-    def extract_from_text(text: str):
-        """Extract URLs from text content."""
-        print(f"Searching in text of length: {len(text)}")
+    def add_from_text(text: str) -> int:
+        """Add URLs from text content to the result set as they are matched; return how many were new."""
+        trace("Searching in text of length: %s", len(text))
+        before = len(urls)
+        # Undo \/ escaping up front, so partially escaped URLs ("https://a.com\/b.png",
+        # "https:/\/a.com/b.png") match too, not just fully escaped or plain ones
+        if '\\/' in text:
+            text = text.replace('\\/', '/')
         
-        # Pattern for URLs with image extensions
-        url_pattern = r'https?://[^\s"\'<>\\]+' + image_extensions
-        found_urls = re.findall(url_pattern, text, re.IGNORECASE)
-        print(f"Found direct URLs: {found_urls}")
+        # Matches go straight into the set, so repeated URLs never build up in a list
+        for match in _URL_RE.finditer(text):
+            url = match.group()
+            trace("Found URL: %s", url)
+            urls.add(url)
         
-        # Also look for escaped URLs (with \/)
-        escaped_url_pattern = r'https?:\\?/\\?/[^\s"\'<>]+' + image_extensions
-        escaped_urls = re.findall(escaped_url_pattern, text, re.IGNORECASE)
-        print(f"Found escaped URLs: {escaped_urls}")
-        
-        # Clean up escaped URLs
-        escaped_urls = [url.replace('\\/', '/').replace('\\', '') for url in escaped_urls]
-        print(f"Cleaned escaped URLs: {escaped_urls}")
-        
-        return found_urls + escaped_urls
+        return len(urls) - before
     
-    def recursive_search(obj, depth=0):
-        """Recursively search through JSON object for image URLs."""
-        indent = "  " * depth
-        print(f"{indent}Searching object type: {type(obj)}")
-        
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                print(f"{indent}Key: {key}")
-                # Check if key suggests it might contain image URLs
-                if any(img_key in key.lower() for img_key in ['src', 'url', 'image', 'img', 'background', 'photo', 'picture']):
-                    print(f"{indent}  -> Image-related key found!")
-                    if isinstance(value, str):
-                        found = extract_from_text(value)
-                        urls.update(found)
-                        print(f"{indent}  -> Added {len(found)} URLs")
-                recursive_search(value, depth + 1)
-        elif isinstance(obj, list):
-            print(f"{indent}List with {len(obj)} items")
-            for i, item in enumerate(obj):
-                print(f"{indent}Item {i}:")
-                recursive_search(item, depth + 1)
-        elif isinstance(obj, str):
-            print(f"{indent}String of length: {len(obj)}")
-            # Check if string contains escaped JSON
-            if '{' in obj and '}' in obj:
-                print(f"{indent}  -> Contains JSON-like content")
-                try:
-                    # Try to parse as JSON
-                    nested_json = json.loads(obj)
-                    print(f"{indent}  -> Successfully parsed nested JSON")
-                    recursive_search(nested_json, depth + 1)
-                except json.JSONDecodeError as e:
-                    print(f"{indent}  -> JSON parse failed: {e}")
-                    # If not valid JSON, just extract URLs from the string
-                    found = extract_from_text(obj)
-                    urls.update(found)
-                    print(f"{indent}  -> Added {len(found)} URLs from string")
-            else:
-                found = extract_from_text(obj)
-                urls.update(found)
-                print(f"{indent}  -> Added {len(found)} URLs from simple string")
+    def add_from_value(root) -> None:
+        """Scan a parsed value's strings and lists for URLs; objects were already scanned by scan_pairs."""
+        # Explicit stack, so deeply nested lists don't hit the recursion limit
+        stack = [root]
+        while stack:
+            value = stack.pop()
+            # Parsed JSON holds only exact built-in types, so compare type() with `is`
+            kind = type(value)
+            if kind is str:
+                trace("String of length: %s", len(value))
+                # Scanning the string as-is already finds URLs in JSON nested inside
+                # it, plain or \/-escaped, without parsing it
+                added = add_from_text(value)
+                trace("  -> Added %s new URLs from string", added)
+                
+                # Parse nested JSON only when its own escapes (\\, \uXXXX, ...) can hide
+                # URLs from that scan, as for the top-level document
+                if value.lstrip().startswith(('{', '[')) and _ESCAPE_RE.search(value):
+                    trace("  -> Contains escaped JSON-like content")
+                    try:
+                        stack.append(parse(value))
+                        trace("  -> Successfully parsed nested JSON")
+                    except json.JSONDecodeError as e:
+                        trace("  -> JSON parse failed: %s", e)
+            elif kind is list:
+                trace("List with %s items", len(value))
+                # Pushed in reverse so items are traced in document order
+                stack.extend(reversed(value))
     
-    print("=== Starting URL extraction ===")
+    def scan_pairs(pairs) -> None:
+        """object_pairs_hook: scan each member as the parser builds an object, then drop the object."""
+        for key, value in pairs:
+            trace("Key: %s", key)
+            # Flag keys that suggest image URLs; values are scanned like any other
+            if tracing and _IMG_KEY_RE.search(key.lower()):
+                trace("  -> Image-related key found!")
+            add_from_value(value)
+        # Returning None instead of the dict means no parsed tree is ever kept
+        return None
+    
+    def parse(text: str):
+        """Parse JSON text, scanning objects bottom-up as they are decoded."""
+        return json.loads(text, object_pairs_hook=scan_pairs)
+    
+    logger.info("=== Starting URL extraction ===")
     
     # First, extract URLs directly from the raw content
-    print("\n1. Extracting from raw content...")
-    raw_urls = extract_from_text(json_content)
-    urls.update(raw_urls)
-    print(f"Raw extraction found: {len(raw_urls)} URLs")
+    logger.info("\n1. Extracting from raw content...")
+    logger.info("Raw extraction found: %s unique URLs", add_from_text(json_content))
     
-    # Then try to parse as JSON and search recursively
-    print("\n2. Parsing as JSON and searching recursively...")
-    try:
-        parsed_json = json.loads(json_content)
-        print("Successfully parsed main JSON")
-        recursive_search(parsed_json)
-    except json.JSONDecodeError as e:
-        print(f"Main JSON parse failed: {e}")
+    # The raw pass already matched every URL written plainly or with any \/ escapes.
+    # Scanning the parsed strings only finds more when other escapes (\\, \uXXXX,
+    # \n between URLs, JSON nested in strings) hide URLs from the raw pattern.
+    if not _ESCAPE_RE.search(json_content):
+        logger.info("\n2. No escapes besides \\/ in the raw content; skipping the parsed scan")
+    else:
+        logger.info("\n2. Parsing as JSON and scanning decoded strings...")
+        try:
+            add_from_value(parse(json_content))
+            logger.info("Successfully parsed main JSON")
+        except json.JSONDecodeError as e:
+            logger.warning("Main JSON parse failed: %s", e)
     
-    print(f"\n=== Total URLs found: {len(urls)} ===")
+    logger.info("\n=== Total URLs found: %s ===", len(urls))
     for url in sorted(urls):
-        print(f"  - {url}")
+        logger.info("  - %s", url)
     
     return urls
 
 # Test with the Water Flow JSON file
 if __name__ == "__main__":
+    # -v/--verbose adds the per-node trace
+    verbose = '-v' in sys.argv[1:] or '--verbose' in sys.argv[1:]
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format='%(message)s')
+    
     with open("/Volumes/SSD/Diviflow Projects/placeholder/json/Water Flow - Full Page.json", "r") as f:
         content = f.read()
     
@@ -6,19 +6,22 @@ with open('json/Water Flow - Full Page.json', 'r', encoding='utf-8') as f:
 
 print(f'File size: {len(content)} characters')
 
-# Test patterns based on what we see in the actual content
-patterns = [
+# Shared image-extension alternation
+IMG_EXT = r'\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)'
+
+# Test patterns based on what we see in the actual content, compiled once
+patterns = [re.compile(pattern, re.IGNORECASE) for pattern in (
     # Pattern for URLs with \/ escaping (what we see in the JSON)
-    r'https?:\\/\\/[^"\'<>]+\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)',
+    r'https?:\\/\\/[^"\'<>]+' + IMG_EXT,
     # Pattern for direct URLs without escaping
-    r'https?://[^"\'<>\s]+\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)',
+    r'https?://[^"\'<>\s]+' + IMG_EXT,
     # More specific pattern for the domains we see
-    r'https?:\\/\\/(?:demo\.diviflow\.com|diviflow\.local)[^"\'<>]*\.(?:jpg|jpeg|png|gif|bmp|webp|svg|tiff|tif|ico|avif|heic|heif)',
-]
+    r'https?:\\/\\/(?:demo\.diviflow\.com|diviflow\.local)[^"\'<>]*' + IMG_EXT,
+)]
 
 for i, pattern in enumerate(patterns, 1):
     try:
-        matches = re.findall(pattern, content, re.IGNORECASE)
+        matches = pattern.findall(content)
         print(f'Pattern {i} matches: {len(matches)}')
         if matches:
             print(f'  First match: {matches[0]}')
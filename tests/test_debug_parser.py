@@ -0,0 +1,26 @@
+import unittest
+
+from debug_parser import extract_image_urls_debug
+
+
+class ExtractImageUrlsDebugTest(unittest.TestCase):
+    def test_plain_and_fully_escaped_urls(self):
+        content = '{"a": "https://a.com/b.png", "b": "https:\\/\\/a.com\\/c.png"}'
+        self.assertEqual(extract_image_urls_debug(content),
+                         {'https://a.com/b.png', 'https://a.com/c.png'})
+
+    def test_url_escaped_only_in_path(self):
+        content = '{"src": "https://a.com\\/b.png"}'
+        self.assertEqual(extract_image_urls_debug(content), {'https://a.com/b.png'})
+
+    def test_url_escaped_only_in_scheme(self):
+        content = '{"src": "https:/\\/a.com/b.png"}'
+        self.assertEqual(extract_image_urls_debug(content), {'https://a.com/b.png'})
+
+    def test_url_in_nested_json_string(self):
+        content = '{"data": "{\\"src\\": \\"https:\\\\/\\\\/a.com\\\\/b.png\\"}"}'
+        self.assertEqual(extract_image_urls_debug(content), {'https://a.com/b.png'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import time
+import unittest
+
+import app
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(name: str) -> str:
+    """Return a fixture file's text."""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class ExtractImageUrlsTest(unittest.TestCase):
+    def test_divi_export_matches_baseline(self):
+        expected = set(read_fixture("divi_export.urls.txt").splitlines())
+        self.assertEqual(app.extract_image_urls(read_fixture("divi_export.json")), expected)
+
+    def test_no_scheme_separator_skips_scan(self):
+        self.assertEqual(app.extract_image_urls('{"src": "images/logo.png"}'), set())
+
+
+# Overlapping escaped and direct starts; a leftmost-longest span merge loses the second URL
+OVERLAP_COUNTEREXAMPLE = 'http://ahttps:\\/\\/x.jpg http://\\/x.jpg/'
+
+# Characters that IGNORECASE or \s treat differently in re and RE2
+UNICODE_EDGE_CASES = (
+    'see https://a.com/x\xa0and\xa0b.png',
+    'see https://a.com/x\u2028b.png',
+    'see https://a.com/x\vb.png',
+    'https://a.com/b.g\u0131f',
+    'http\u017f://a.com/b.png',
+    'HTTPS://A.COM/B.PNG',
+)
+
+
+class MatcherEquivalenceTest(unittest.TestCase):
+    def test_re_finds_both_overlapping_urls(self):
+        matches = [m.group(0) for m in app._URL_RE.finditer(OVERLAP_COUNTEREXAMPLE)]
+        self.assertEqual(matches, ['http://ahttps:\\/\\/x.jpg', 'http://\\/x.jpg'])
+
+    @unittest.skipUnless(app.RE2_AVAILABLE, "google-re2 not installed")
+    def test_re2_agrees_with_re(self):
+        re2_matcher = app.re2.compile(app._URL_RE.pattern)
+        for text in (OVERLAP_COUNTEREXAMPLE, read_fixture("divi_export.json")) + UNICODE_EDGE_CASES:
+            with self.subTest(text=text[:40]):
+                self.assertEqual(
+                    [m.group(0) for m in re2_matcher.finditer(text)],
+                    [m.group(0) for m in app._URL_RE.finditer(text)]
+                )
+
+    def test_re_uses_ascii_case_and_whitespace(self):
+        self.assertEqual(
+            [[m.group(0) for m in app._URL_RE.finditer(text)] for text in UNICODE_EDGE_CASES],
+            [['https://a.com/x\xa0and\xa0b.png'], ['https://a.com/x\u2028b.png'], [], [], [],
+             ['HTTPS://A.COM/B.PNG']]
+        )
+
+    def test_extract_uses_configured_matcher(self):
+        self.assertEqual(
+            app.extract_image_urls(OVERLAP_COUNTEREXAMPLE),
+            {'http://ahttps://x.jpg', 'http:///x.jpg'}
+        )
+
+
+class LinearTimeTest(unittest.TestCase):
+    def test_re_fallback_is_linear_on_scheme_runs(self):
+        # Uncapped, 16k repetitions took about 9 s; capped they take well under 0.1 s
+        for unit in ('http://', 'http:\\/\\/'):
+            with self.subTest(unit=unit):
+                start = time.perf_counter()
+                self.assertEqual(list(app._URL_RE.finditer(unit * 16000)), [])
+                self.assertLess(time.perf_counter() - start, 2.0)
+
+    @unittest.skipUnless(app.RE2_AVAILABLE, "google-re2 not installed")
+    def test_re2_compiles_capped_pattern(self):
+        self.assertIsNot(app._URL_MATCHER, app._URL_RE)
+
+
+if __name__ == "__main__":
+    unittest.main()